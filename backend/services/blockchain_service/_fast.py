@@ -0,0 +1,66 @@
+"""
+Hot-path helpers for the blockchain bridge client
+Fully annotated so the module can be compiled with mypyc (see Dockerfile);
+when no compiled extension is present the same code runs as plain Python
+"""
+
+import hashlib
+import time
+from typing import Any, Dict
+
+
+def sha256_hex(payload: bytes) -> str:
+    """SHA256 hex digest of a payload"""
+    return hashlib.sha256(payload).hexdigest()
+
+
+def did_metadata(
+    digital_id: str,
+    consent_hash: str,
+    issued_at_ns: int,
+    expires_at_ns: int,
+    issuer: str
+) -> Dict[str, Any]:
+    """Metadata for an issue_did transaction"""
+    return {
+        "digital_id": digital_id,
+        "consent_hash": consent_hash,
+        "issued_at_ns": issued_at_ns,
+        "expires_at_ns": expires_at_ns,
+        "issuer": issuer
+    }
+
+
+def incident_metadata(incident_id: str, incident_summary_hash: str, reporter: str) -> Dict[str, Any]:
+    """Metadata for a record_incident transaction"""
+    return {
+        "incident_id": incident_id,
+        "incident_summary_hash": incident_summary_hash,
+        "created_at_ns": time.time_ns(),
+        "reporter": reporter
+    }
+
+
+def evidence_metadata(
+    evidence_hash: str,
+    incident_id: str,
+    uploaded_by: str,
+    evidence_type: str
+) -> Dict[str, Any]:
+    """Metadata for an anchor_evidence transaction"""
+    return {
+        "evidence_hash": evidence_hash,
+        "incident_id": incident_id,
+        "uploaded_by": uploaded_by,
+        "evidence_type": evidence_type,
+        "uploaded_at_ns": time.time_ns()
+    }
+
+
+def audit_metadata(audit_id: str, audit_hash: str) -> Dict[str, Any]:
+    """Metadata for an append_audit transaction"""
+    return {
+        "audit_id": audit_id,
+        "audit_hash": audit_hash,
+        "created_at_ns": time.time_ns()
+    }
@@ -1,22 +1,169 @@
 """
 API Client for Blockchain Bridge Service
 Provides a Python interface for other services to interact with the blockchain bridge
+
+Timestamps in transaction metadata (issued_at_ns, expires_at_ns, created_at_ns,
+uploaded_at_ns) are integer nanoseconds since the Unix epoch, UTC.
+Use ns_to_datetime() to turn them back into datetimes.
 """
 
 import asyncio
-import json
 import hashlib
 import logging
-from datetime import datetime, timezone
-from typing import Dict, Any, Optional, List
+import socket
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple, Union, AsyncIterable, BinaryIO
 from dataclasses import dataclass
 
 import httpx
+import msgspec
+import orjson
 import redis.asyncio as redis
 
+from _fast import sha256_hex, did_metadata, incident_metadata, evidence_metadata, audit_metadata
+
 logger = logging.getLogger(__name__)
 
-@dataclass
+_UTC = timezone.utc
+_JSON_HEADERS = {"content-type": "application/json"}
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=_UTC)
+
+def _datetime_to_ns(moment: datetime) -> int:
+    """Nanoseconds since the epoch; naive datetimes are taken as UTC"""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=_UTC)
+    return (moment - _EPOCH) // timedelta(microseconds=1) * 1000
+
+def ns_to_datetime(ns: int) -> datetime:
+    """Convert a metadata *_ns timestamp back into an aware UTC datetime"""
+    return _EPOCH + timedelta(microseconds=ns // 1000)
+
+def _one_year_after(moment: datetime) -> datetime:
+    """Same calendar date one year later (Feb 29 rolls back to Feb 28)"""
+    try:
+        return moment.replace(year=moment.year + 1)
+    except ValueError:
+        return moment.replace(year=moment.year + 1, day=28)
+
+# Process-wide HTTP client shared by every BlockchainBridgeClient instance
+_shared_http_client: Optional[httpx.AsyncClient] = None
+_shared_http_refcount = 0
+
+def _acquire_http_client(timeout: int) -> httpx.AsyncClient:
+    """Return the shared HTTP client, creating it on first use"""
+    global _shared_http_client, _shared_http_refcount
+    if _shared_http_client is None or _shared_http_client.is_closed:
+        # The transport retries failed connection attempts, which never reach the bridge
+        transport = httpx.AsyncHTTPTransport(
+            http2=True,
+            retries=3,
+            limits=httpx.Limits(max_keepalive_connections=64, max_connections=128)
+        )
+        _shared_http_client = httpx.AsyncClient(
+            transport=transport,
+            timeout=httpx.Timeout(timeout, connect=5.0)
+        )
+        _shared_http_refcount = 0
+    _shared_http_refcount += 1
+    return _shared_http_client
+
+async def _release_http_client():
+    """Drop one reference to the shared HTTP client, closing it on the last one"""
+    global _shared_http_client, _shared_http_refcount
+    _shared_http_refcount = max(_shared_http_refcount - 1, 0)
+    if _shared_http_refcount == 0 and _shared_http_client is not None:
+        await _shared_http_client.aclose()
+        _shared_http_client = None
+
+# Redis connection pools shared by every BlockchainBridgeClient, one per URL
+_redis_pools: Dict[str, redis.ConnectionPool] = {}
+
+def _get_redis_pool(redis_url: str) -> redis.ConnectionPool:
+    """Return the shared connection pool for a Redis URL, creating it on first use"""
+    pool = _redis_pools.get(redis_url)
+    if pool is None:
+        pool = redis.ConnectionPool.from_url(redis_url, max_connections=64, decode_responses=False)
+        _redis_pools[redis_url] = pool
+    return pool
+
+# Bridge operation names
+OP_ISSUE_DID = "issue_did"
+OP_RECORD_INCIDENT = "record_incident"
+OP_ANCHOR_EVIDENCE = "anchor_evidence"
+OP_APPEND_AUDIT = "append_audit"
+
+# Evidence is hashed in chunks of this size so large recordings never block the loop
+HASH_CHUNK_SIZE = 1 << 20
+
+EvidenceSource = Union[bytes, AsyncIterable[bytes], BinaryIO]
+
+# Buffers above this size are hashed by the kernel crypto API (AF_ALG) when available
+KERNEL_HASH_MIN_SIZE = 256 * 1024
+
+def _kernel_sha256_available() -> bool:
+    """Check once whether the Linux kernel exposes sha256 over AF_ALG"""
+    if sys.platform != "linux" or not hasattr(socket, "AF_ALG"):
+        return False
+    try:
+        with socket.socket(socket.AF_ALG, socket.SOCK_SEQPACKET, 0) as sock:
+            sock.bind(("hash", "sha256"))
+        return True
+    except OSError:
+        return False
+
+_KERNEL_SHA256 = _kernel_sha256_available()
+
+def _kernel_sha256(buf) -> bytes:
+    """SHA256 digest computed by the kernel; chunks are sent with MSG_MORE until the end"""
+    with socket.socket(socket.AF_ALG, socket.SOCK_SEQPACKET, 0) as sock:
+        sock.bind(("hash", "sha256"))
+        op, _ = sock.accept()
+        with op:
+            view = memoryview(buf)
+            for start in range(0, len(view), HASH_CHUNK_SIZE):
+                op.sendall(view[start:start + HASH_CHUNK_SIZE], socket.MSG_MORE)
+            op.send(b"")
+            return op.recv(32)
+
+def _sha256_hex_large(buf) -> str:
+    """SHA256 hex digest of a large buffer, preferring the kernel implementation"""
+    if _KERNEL_SHA256 and len(buf) > KERNEL_HASH_MIN_SIZE:
+        try:
+            return _kernel_sha256(buf).hex()
+        except OSError as e:
+            logger.debug(f"Kernel SHA256 failed, falling back to hashlib: {e}")
+    return hashlib.sha256(buf).hexdigest()
+
+# Wire formats for the submission path, encoded/decoded by msgspec
+class SubmitRequest(msgspec.Struct):
+    """Body of POST /transactions"""
+    op: str
+    payload_hash: str
+    metadata: Dict[str, Any]
+
+class SubmitResponse(msgspec.Struct):
+    """Response of POST /transactions (and each batch item)"""
+    tx_id: str
+    status: str
+    error: Optional[str] = None
+
+class BatchSubmitRequest(msgspec.Struct):
+    """Body of POST /transactions:batch"""
+    ops: List[SubmitRequest]
+
+class BatchSubmitResponse(msgspec.Struct):
+    """Response of POST /transactions:batch"""
+    results: List[SubmitResponse]
+
+_json_encoder = msgspec.json.Encoder()
+_submit_decoder = msgspec.json.Decoder(SubmitResponse)
+_batch_decoder = msgspec.json.Decoder(BatchSubmitResponse)
+
+@dataclass(slots=True)
 class TransactionResult:
     """Result of a blockchain transaction"""
     tx_id: str
@@ -29,19 +176,54 @@ class BlockchainBridgeClient:
     """
     Client for interacting with the Blockchain Bridge service
     Used by Auth, Alert, and Operator services
+
+    All instances share one long-lived HTTP/2 AsyncClient (single scoped
+    client pattern): creating an AsyncClient per instance or per request
+    defeats connection pooling and pays a TCP/TLS handshake every time.
+    connect() takes a reference on the shared client and close() releases
+    it; the client is only torn down when the last reference goes away.
+    The first instance to connect decides the timeout.
+
+    Transaction submissions are queued and coalesced: calls arriving within
+    batch_window seconds of each other (up to max_batch) go out as a single
+    POST /transactions:batch.
     """
     
+    # Hashes of immutable payloads are memoized by object identity for retries/re-uploads
+    # of the same buffer; entries pin their payload, so both count and size are bounded
+    HASH_CACHE_MAX_ENTRIES = 32
+    HASH_CACHE_MAX_BYTES = 64 * 1024 * 1024
+    
     def __init__(
         self,
         base_url: str = "http://localhost:8002",
         redis_url: str = "redis://localhost:6379",
-        timeout: int = 30
+        timeout: int = 30,
+        max_batch: int = 32,
+        batch_window: float = 0.002,
+        max_retries: int = 3,
+        retry_backoff: float = 0.1
     ):
         self.base_url = base_url.rstrip('/')
+        self._url_tx = f"{self.base_url}/transactions"
+        self._url_tx_batch = f"{self.base_url}/transactions:batch"
+        self._url_tx_status = f"{self.base_url}/transactions/"
+        self._url_query = f"{self.base_url}/queries"
+        self._url_health = f"{self.base_url}/health"
         self.redis_url = redis_url
         self.timeout = timeout
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
         self._http_client: Optional[httpx.AsyncClient] = None
         self._redis_client: Optional[redis.Redis] = None
+        self._submit_queue: Optional[asyncio.Queue] = None
+        self._batch_worker: Optional[asyncio.Task] = None
+        self._flush_tasks: set = set()
+        self._batch_supported = True
+        self._hash_cache: "OrderedDict[int, Tuple[bytes, str]]" = OrderedDict()
+        self._hash_cache_bytes = 0
         
     async def __aenter__(self):
         """Async context manager entry"""
@@ -54,108 +236,215 @@ class BlockchainBridgeClient:
     
     async def connect(self):
         """Initialize connections"""
-        self._http_client = httpx.AsyncClient(timeout=self.timeout)
-        self._redis_client = redis.from_url(self.redis_url)
+        if self._http_client is None:
+            self._http_client = _acquire_http_client(self.timeout)
+        self._redis_client = redis.Redis(connection_pool=_get_redis_pool(self.redis_url))
     
     async def close(self):
         """Close connections"""
+        if self._batch_worker:
+            self._batch_worker.cancel()
+            self._batch_worker = None
+        for task in list(self._flush_tasks):
+            task.cancel()
+        if self._submit_queue:
+            while not self._submit_queue.empty():
+                _, future = self._submit_queue.get_nowait()
+                if not future.done():
+                    future.set_result(self._error_result("Client closed before submission"))
+            self._submit_queue = None
         if self._http_client:
-            await self._http_client.aclose()
-        if self._redis_client:
-            await self._redis_client.close()
+            self._http_client = None
+            await _release_http_client()
+        # The Redis pool is shared; see shutdown_pools() for process exit
+        self._redis_client = None
+    
+    @staticmethod
+    async def shutdown_pools():
+        """Close the shared HTTP client and Redis pools; call once at process exit"""
+        global _shared_http_client, _shared_http_refcount
+        if _shared_http_client is not None:
+            await _shared_http_client.aclose()
+            _shared_http_client = None
+            _shared_http_refcount = 0
+        for pool in _redis_pools.values():
+            await pool.disconnect()
+        _redis_pools.clear()
+    
+    def _cached_payload_hash(self, payload: bytes) -> Optional[str]:
+        """Return the memoized hash if this exact bytes object was hashed before"""
+        if type(payload) is not bytes:
+            return None
+        entry = self._hash_cache.get(id(payload))
+        if entry is None or entry[0] is not payload:
+            return None
+        self._hash_cache.move_to_end(id(payload))
+        return entry[1]
+    
+    def _remember_payload_hash(self, payload: bytes, digest: str):
+        """Memoize the hash of an immutable payload, evicting the oldest entries"""
+        if type(payload) is not bytes or len(payload) > self.HASH_CACHE_MAX_BYTES:
+            return
+        previous = self._hash_cache.pop(id(payload), None)
+        if previous is not None:
+            self._hash_cache_bytes -= len(previous[0])
+        self._hash_cache[id(payload)] = (payload, digest)
+        self._hash_cache_bytes += len(payload)
+        while (len(self._hash_cache) > self.HASH_CACHE_MAX_ENTRIES
+               or self._hash_cache_bytes > self.HASH_CACHE_MAX_BYTES):
+            _, (evicted, _) = self._hash_cache.popitem(last=False)
+            self._hash_cache_bytes -= len(evicted)
     
     def _generate_payload_hash(self, payload: bytes) -> str:
-        """Generate SHA256 hash for payload"""
-        return hashlib.sha256(payload).hexdigest()
+        """Generate SHA256 hash for payload, reusing the cached result for the same object"""
+        digest = self._cached_payload_hash(payload)
+        if digest is not None:
+            return digest
+        
+        digest = sha256_hex(payload) if len(payload) <= HASH_CHUNK_SIZE else _sha256_hex_large(payload)
+        self._remember_payload_hash(payload, digest)
+        return digest
+    
+    def clear_hash_cache(self):
+        """Drop all memoized payload hashes"""
+        self._hash_cache.clear()
+        self._hash_cache_bytes = 0
+    
+    def _resolve_payload_hash(self, payload: Optional[bytes], precomputed_hash: Optional[str]) -> str:
+        """Use an upstream hash when given, otherwise hash the payload"""
+        if precomputed_hash:
+            return precomputed_hash
+        if payload is None:
+            raise ValueError("Either payload data or a precomputed hash must be provided")
+        return self._generate_payload_hash(payload)
     
     async def issue_did(
         self,
         digital_id: str,
-        consent_data: bytes,
+        consent_data: Optional[bytes],
         issuer: str,
-        expires_at: Optional[datetime] = None
+        expires_at: Optional[datetime] = None,
+        consent_hash: Optional[str] = None
     ) -> TransactionResult:
         """
         Issue a Digital Identity (DID)
         Called by Auth & Onboarding service
+        Pass consent_hash (with consent_data=None) when it is already known
         """
-        consent_hash = self._generate_payload_hash(consent_data)
+        consent_hash = self._resolve_payload_hash(consent_data, consent_hash)
         
+        now_ns = time.time_ns()
         if expires_at is None:
-            expires_at = datetime.now(timezone.utc).replace(year=datetime.now().year + 1)
-        
-        metadata = {
-            "digital_id": digital_id,
-            "consent_hash": consent_hash,
-            "issued_at": datetime.now(timezone.utc).isoformat(),
-            "expires_at": expires_at.isoformat(),
-            "issuer": issuer
-        }
+            expires_at = _one_year_after(ns_to_datetime(now_ns))
+        
+        metadata = did_metadata(digital_id, consent_hash, now_ns, _datetime_to_ns(expires_at), issuer)
         
-        return await self._submit_transaction("issue_did", consent_hash, metadata)
+        return await self._submit_transaction(OP_ISSUE_DID, consent_hash, metadata)
     
     async def record_incident(
         self,
         incident_id: str,
-        incident_summary: bytes,
-        reporter: str
+        incident_summary: Optional[bytes],
+        reporter: str,
+        incident_summary_hash: Optional[str] = None
     ) -> TransactionResult:
         """
         Record an incident on the blockchain
         Called by Alert Management service when e-FIR is generated
+        Pass incident_summary_hash (with incident_summary=None) when it is already known
         """
-        incident_summary_hash = self._generate_payload_hash(incident_summary)
+        incident_summary_hash = self._resolve_payload_hash(incident_summary, incident_summary_hash)
         
-        metadata = {
-            "incident_id": incident_id,
-            "incident_summary_hash": incident_summary_hash,
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "reporter": reporter
-        }
+        metadata = incident_metadata(incident_id, incident_summary_hash, reporter)
         
-        return await self._submit_transaction("record_incident", incident_summary_hash, metadata)
+        return await self._submit_transaction(OP_RECORD_INCIDENT, incident_summary_hash, metadata)
     
     async def anchor_evidence(
         self,
         incident_id: str,
-        evidence_data: bytes,
+        evidence_data: Optional[EvidenceSource],
         uploaded_by: str,
-        evidence_type: str = "audio_recording"
+        evidence_type: str = "audio_recording",
+        evidence_hash: Optional[str] = None
     ) -> TransactionResult:
         """
         Anchor evidence to the blockchain
         Called by Operator service to anchor call recording hashes
+        evidence_data may be bytes, an async iterable of byte chunks or a
+        binary file object; non-bytes sources are hashed chunk by chunk.
+        Pass evidence_hash (with evidence_data=None) when it is already known
         """
-        evidence_hash = self._generate_payload_hash(evidence_data)
-        
-        metadata = {
-            "evidence_hash": evidence_hash,
-            "incident_id": incident_id,
-            "uploaded_by": uploaded_by,
-            "evidence_type": evidence_type,
-            "uploaded_at": datetime.now(timezone.utc).isoformat()
-        }
+        if not evidence_hash:
+            if evidence_data is None:
+                raise ValueError("Either evidence data or a precomputed hash must be provided")
+            evidence_hash = await self._hash_evidence(evidence_data)
+        return await self._anchor_evidence_hash(incident_id, evidence_hash, uploaded_by, evidence_type)
+    
+    async def anchor_evidence_file(
+        self,
+        incident_id: str,
+        path: str,
+        uploaded_by: str,
+        evidence_type: str = "audio_recording"
+    ) -> TransactionResult:
+        """Anchor evidence stored in a file without loading it into memory"""
+        def digest_file() -> str:
+            with open(path, "rb") as f:
+                return hashlib.file_digest(f, "sha256").hexdigest()
         
-        return await self._submit_transaction("anchor_evidence", evidence_hash, metadata)
+        evidence_hash = await asyncio.to_thread(digest_file)
+        return await self._anchor_evidence_hash(incident_id, evidence_hash, uploaded_by, evidence_type)
+    
+    async def _anchor_evidence_hash(
+        self,
+        incident_id: str,
+        evidence_hash: str,
+        uploaded_by: str,
+        evidence_type: str
+    ) -> TransactionResult:
+        """Submit an anchor_evidence transaction for an already computed hash"""
+        metadata = evidence_metadata(evidence_hash, incident_id, uploaded_by, evidence_type)
+        
+        return await self._submit_transaction(OP_ANCHOR_EVIDENCE, evidence_hash, metadata)
+    
+    async def _hash_evidence(self, source: EvidenceSource) -> str:
+        """SHA256 of an evidence source, hashing large inputs off the event loop"""
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            if len(source) <= HASH_CHUNK_SIZE:
+                return self._generate_payload_hash(source)
+            digest = self._cached_payload_hash(source)
+            if digest is None:
+                digest = await asyncio.to_thread(_sha256_hex_large, source)
+                self._remember_payload_hash(source, digest)
+            return digest
+        
+        if not hasattr(source, "__aiter__"):
+            return await asyncio.to_thread(lambda: hashlib.file_digest(source, "sha256").hexdigest())
+        
+        hasher = hashlib.sha256()
+        async for chunk in source:
+            if len(chunk) > HASH_CHUNK_SIZE:
+                await asyncio.to_thread(hasher.update, chunk)
+            else:
+                hasher.update(chunk)
+        return hasher.hexdigest()
     
     async def append_audit(
         self,
-        audit_data: bytes,
-        audit_id: str
+        audit_data: Optional[bytes],
+        audit_id: str,
+        audit_hash: Optional[str] = None
     ) -> TransactionResult:
         """
         Append audit block to blockchain
         Optional operation for audit trail
+        Pass audit_hash (with audit_data=None) when it is already known
         """
-        audit_hash = self._generate_payload_hash(audit_data)
+        audit_hash = self._resolve_payload_hash(audit_data, audit_hash)
         
-        metadata = {
-            "audit_id": audit_id,
-            "audit_hash": audit_hash,
-            "created_at": datetime.now(timezone.utc).isoformat()
-        }
+        metadata = audit_metadata(audit_id, audit_hash)
         
-        return await self._submit_transaction("append_audit", audit_hash, metadata)
+        return await self._submit_transaction(OP_APPEND_AUDIT, audit_hash, metadata)
     
     async def _submit_transaction(
         self,
@@ -163,48 +452,150 @@ class BlockchainBridgeClient:
         payload_hash: str,
         metadata: Dict[str, Any]
     ) -> TransactionResult:
-        """Submit transaction to blockchain bridge"""
+        """
+        Submit transaction to blockchain bridge
+        Calls arriving within batch_window are coalesced into one batch request
+        """
         if not self._http_client:
             raise RuntimeError("Client not connected. Use async context manager or call connect()")
         
-        try:
-            request_data = {
-                "op": op,
-                "payload_hash": payload_hash,
-                "metadata": metadata
-            }
+        request_data = SubmitRequest(op, payload_hash, metadata)
+        
+        if self._submit_queue is None:
+            self._submit_queue = asyncio.Queue()
+        if self._batch_worker is None or self._batch_worker.done():
+            self._batch_worker = asyncio.create_task(self._run_batch_worker())
+        
+        future = asyncio.get_running_loop().create_future()
+        await self._submit_queue.put((request_data, future))
+        return await future
+    
+    async def _run_batch_worker(self):
+        """Drain the submit queue in batches of up to max_batch items"""
+        while True:
+            batch = [await self._submit_queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(await asyncio.wait_for(self._submit_queue.get(), timeout=self.batch_window))
+                except asyncio.TimeoutError:
+                    break
             
-            response = await self._http_client.post(
-                f"{self.base_url}/transactions",
-                json=request_data
+            # Flush in the background so several batches can be in flight at once
+            task = asyncio.create_task(self._deliver_batch(batch))
+            self._flush_tasks.add(task)
+            task.add_done_callback(self._flush_tasks.discard)
+    
+    async def _deliver_batch(self, batch: List[tuple]):
+        """Flush one batch and resolve each caller's future with its result"""
+        try:
+            results = await self._flush_batch([request_data for request_data, _ in batch])
+        except asyncio.CancelledError:
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(self._error_result("Client closed before submission"))
+            raise
+        except Exception as e:
+            error_msg = f"Transaction submission error: {str(e)}"
+            logger.error(error_msg)
+            results = [self._error_result(error_msg) for _ in batch]
+        
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+        
+        # A short response must not leave callers waiting forever
+        if len(results) < len(batch):
+            logger.error(f"Bridge returned {len(results)} results for a batch of {len(batch)}")
+            for _, future in batch[len(results):]:
+                if not future.done():
+                    future.set_result(self._error_result("No result returned for batched transaction"))
+    
+    async def _flush_batch(self, requests: List[SubmitRequest]) -> List[TransactionResult]:
+        """Send a batch to the bridge, falling back to single submissions if unsupported"""
+        if len(requests) == 1 or not self._batch_supported:
+            return await asyncio.gather(*(self._post_transaction(r) for r in requests))
+        
+        response = await self._post_with_retry(
+            self._url_tx_batch,
+            "batch",
+            _json_encoder.encode(BatchSubmitRequest(requests))
+        )
+        
+        if response.status_code == 404:
+            logger.info("Bridge has no batch route, falling back to single submissions")
+            self._batch_supported = False
+            return await asyncio.gather(*(self._post_transaction(r) for r in requests))
+        
+        if response.status_code != 200:
+            error_msg = f"Batch submission failed: {response.status_code}"
+            logger.error(f"{error_msg} - {response.text}")
+            return [self._error_result(error_msg) for _ in requests]
+        
+        submitted_at = datetime.now(_UTC)
+        results = []
+        for item in _batch_decoder.decode(response.content).results:
+            if item.status == "submitted":
+                results.append(TransactionResult(
+                    tx_id=item.tx_id,
+                    status=item.status,
+                    submitted_at=submitted_at
+                ))
+            else:
+                results.append(self._error_result(item.error or "Transaction submission failed"))
+        return results
+    
+    async def _post_transaction(self, request_data: SubmitRequest) -> TransactionResult:
+        """Submit a single transaction to the bridge"""
+        try:
+            response = await self._post_with_retry(
+                self._url_tx,
+                request_data.op,
+                _json_encoder.encode(request_data)
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = _submit_decoder.decode(response.content)
                 return TransactionResult(
-                    tx_id=data["tx_id"],
-                    status=data["status"],
-                    submitted_at=datetime.now(timezone.utc)
+                    tx_id=data.tx_id,
+                    status=data.status,
+                    submitted_at=datetime.now(_UTC)
                 )
             else:
                 error_msg = f"Transaction submission failed: {response.status_code}"
                 logger.error(f"{error_msg} - {response.text}")
-                return TransactionResult(
-                    tx_id="",
-                    status="error",
-                    submitted_at=datetime.now(timezone.utc),
-                    error=error_msg
-                )
+                return self._error_result(error_msg)
                 
         except Exception as e:
             error_msg = f"Transaction submission error: {str(e)}"
             logger.error(error_msg)
-            return TransactionResult(
-                tx_id="",
-                status="error", 
-                submitted_at=datetime.now(timezone.utc),
-                error=error_msg
-            )
+            return self._error_result(error_msg)
+    
+    async def _post_with_retry(self, url: str, op: str, body: bytes) -> httpx.Response:
+        """
+        POST a submission, retrying 5xx responses with exponential backoff
+        The Idempotency-Key is derived from the body so the bridge can
+        return the original result if a retried request was already applied
+        """
+        headers = {
+            **_JSON_HEADERS,
+            "Idempotency-Key": f"{op}:{hashlib.sha256(body).hexdigest()}"
+        }
+        
+        for attempt in range(self.max_retries + 1):
+            response = await self._http_client.post(url, content=body, headers=headers)
+            if response.status_code < 500 or attempt == self.max_retries:
+                return response
+            logger.warning(f"Bridge returned {response.status_code}, retrying ({attempt + 1}/{self.max_retries})")
+            await asyncio.sleep(self.retry_backoff * (2 ** attempt))
+    
+    def _error_result(self, error_msg: str) -> TransactionResult:
+        """Build a failed TransactionResult"""
+        return TransactionResult(
+            tx_id="",
+            status="error",
+            submitted_at=datetime.now(_UTC),
+            error=error_msg
+        )
     
     async def get_transaction_status(self, tx_id: str) -> Optional[Dict[str, Any]]:
         """Get transaction status by ID"""
@@ -212,10 +603,10 @@ class BlockchainBridgeClient:
             raise RuntimeError("Client not connected")
         
         try:
-            response = await self._http_client.get(f"{self.base_url}/transactions/{tx_id}")
+            response = await self._http_client.get(self._url_tx_status + tx_id)
             
             if response.status_code == 200:
-                return response.json()
+                return orjson.loads(response.content)
             elif response.status_code == 404:
                 return None
             else:
@@ -250,12 +641,13 @@ class BlockchainBridgeClient:
             }
             
             response = await self._http_client.post(
-                f"{self.base_url}/queries",
-                json=request_data
+                self._url_query,
+                content=orjson.dumps(request_data),
+                headers=_JSON_HEADERS
             )
             
             if response.status_code == 200:
-                return response.json()
+                return orjson.loads(response.content)
             else:
                 logger.error(f"Query failed: {response.status_code}")
                 return None
@@ -282,12 +674,12 @@ class BlockchainBridgeClient:
                 params["target_id"] = target_id
             
             response = await self._http_client.get(
-                f"{self.base_url}/transactions",
+                self._url_tx,
                 params=params
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 return data.get("transactions", [])
             else:
                 logger.error(f"Failed to list transactions: {response.status_code}")
@@ -303,36 +695,33 @@ class BlockchainBridgeClient:
         timeout: int = 300
     ) -> Optional[Dict[str, Any]]:
         """
-        Wait for transaction confirmation via Redis pub/sub
+        Wait for transaction confirmation via Redis
+        Subscribes to the per-transaction channel, so only this transaction's
+        event is received, and checks the per-transaction key in case the
+        confirmation was published before we subscribed.
         Returns confirmation event or None if timeout
         """
         if not self._redis_client:
             raise RuntimeError("Redis client not connected")
         
+        channel = f"blockchain.tx.confirmed.{tx_id}"
         pubsub = self._redis_client.pubsub()
-        await pubsub.subscribe("blockchain.tx.confirmed")
+        await pubsub.subscribe(channel)
         
         try:
-            timeout_task = asyncio.create_task(asyncio.sleep(timeout))
-            listen_task = asyncio.create_task(self._listen_for_confirmation(pubsub, tx_id))
-            
-            done, pending = await asyncio.wait(
-                [timeout_task, listen_task],
-                return_when=asyncio.FIRST_COMPLETED
-            )
-            
-            # Cancel remaining tasks
-            for task in pending:
-                task.cancel()
+            stored = await self._redis_client.get(f"blockchain:tx:{tx_id}:confirmed")
+            if stored:
+                return orjson.loads(stored)
             
-            if listen_task in done:
-                return await listen_task
-            else:
+            try:
+                async with asyncio.timeout(timeout):
+                    return await self._listen_for_confirmation(pubsub, tx_id)
+            except TimeoutError:
                 logger.warning(f"Transaction confirmation timeout for {tx_id}")
                 return None
                 
         finally:
-            await pubsub.unsubscribe("blockchain.tx.confirmed")
+            await pubsub.unsubscribe(channel)
             await pubsub.close()
     
     async def _listen_for_confirmation(
@@ -340,16 +729,14 @@ class BlockchainBridgeClient:
         pubsub: redis.client.PubSub,
         target_tx_id: str
     ) -> Optional[Dict[str, Any]]:
-        """Listen for specific transaction confirmation"""
-        async for message in pubsub.listen():
-            if message['type'] == 'message':
+        """Listen for the confirmation on a per-transaction channel"""
+        while True:
+            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            if message and message['type'] == 'message':
                 try:
-                    event = json.loads(message['data'])
-                    if event.get('tx_id') == target_tx_id:
-                        return event
-                except json.JSONDecodeError:
-                    continue
-        return None
+                    return orjson.loads(message['data'])
+                except orjson.JSONDecodeError:
+                    logger.warning(f"Malformed confirmation event for {target_tx_id}")
     
     async def health_check(self) -> bool:
         """Check if the blockchain bridge service is healthy"""
@@ -357,7 +744,7 @@ class BlockchainBridgeClient:
             raise RuntimeError("Client not connected")
         
         try:
-            response = await self._http_client.get(f"{self.base_url}/health")
+            response = await self._http_client.get(self._url_health)
             return response.status_code == 200
         except Exception as e:
             logger.error(f"Health check failed: {e}")
@@ -401,14 +788,19 @@ class AlertServiceIntegration:
     async def create_incident_record(
         self,
         incident_id: str,
-        e_fir_document: bytes,
-        operator_id: str
+        e_fir_document: Optional[bytes],
+        operator_id: str,
+        e_fir_hash: Optional[str] = None
     ) -> str:
-        """Create incident record when e-FIR is generated"""
+        """
+        Create incident record when e-FIR is generated
+        Pass e_fir_hash when the e-FIR's content hash is already stored
+        """
         result = await self.client.record_incident(
             incident_id=incident_id,
             incident_summary=e_fir_document,
-            reporter=operator_id
+            reporter=operator_id,
+            incident_summary_hash=e_fir_hash
         )
         
         if result.status == "submitted":
@@ -427,15 +819,20 @@ class OperatorServiceIntegration:
     async def anchor_call_recording(
         self,
         incident_id: str,
-        audio_data: bytes,
-        operator_id: str
+        audio_data: Optional[bytes],
+        operator_id: str,
+        recording_hash: Optional[str] = None
     ) -> str:
-        """Anchor call recording hash to blockchain"""
+        """
+        Anchor call recording hash to blockchain
+        Pass recording_hash when the recording was already hashed upstream
+        """
         result = await self.client.anchor_evidence(
             incident_id=incident_id,
             evidence_data=audio_data,
             uploaded_by=operator_id,
-            evidence_type="audio_recording"
+            evidence_type="audio_recording",
+            evidence_hash=recording_hash
         )
         
         if result.status == "submitted":
@@ -473,6 +870,8 @@ async def main():
             # Check status
             status = await client.get_transaction_status(result.tx_id)
             print(f"Final status: {status}")
+    
+    await BlockchainBridgeClient.shutdown_pools()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -3,8 +3,10 @@ Configuration management for blockchain bridge service
 """
 
 import os
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Optional
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     """Application settings with validation"""
@@ -44,13 +46,20 @@ class Settings(BaseSettings):
     tx_confirmation_timeout: int = 300  # seconds
     max_retry_attempts: int = 3
     
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = False
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        frozen=True
+    )
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Parse the environment and .env file once and reuse the frozen result"""
+    return Settings()
 
 # Global settings instance
-settings = Settings()
+settings = get_settings()
 
 # Validation functions
 def validate_config():
@@ -79,31 +88,38 @@ def validate_config():
     
     return True
 
+# Read-only views of the settings, built once at import
+FABRIC_CONFIG = MappingProxyType({
+    "dev_mode": settings.fabric_dev_mode,
+    "gateway_url": settings.fabric_gateway_url,
+    "sdk_config": settings.fabric_sdk_config,
+    "wallet_path": settings.wallet_path,
+    "chaincode_name": settings.chaincode_name,
+    "channel_name": settings.channel_name
+})
+
+DATABASE_CONFIG = MappingProxyType({
+    "url": settings.database_url,
+    "min_size": settings.database_pool_min_size,
+    "max_size": settings.database_pool_max_size
+})
+
+REDIS_CONFIG = MappingProxyType({
+    "url": settings.redis_url,
+    "confirmations_channel": settings.redis_channel_confirmations
+})
+
 def get_fabric_config():
-    """Get Fabric configuration based on mode"""
-    return {
-        "dev_mode": settings.fabric_dev_mode,
-        "gateway_url": settings.fabric_gateway_url,
-        "sdk_config": settings.fabric_sdk_config,
-        "wallet_path": settings.wallet_path,
-        "chaincode_name": settings.chaincode_name,
-        "channel_name": settings.channel_name
-    }
+    """Get Fabric configuration based on mode (read-only)"""
+    return FABRIC_CONFIG
 
 def get_database_config():
-    """Get database configuration"""
-    return {
-        "url": settings.database_url,
-        "min_size": settings.database_pool_min_size,
-        "max_size": settings.database_pool_max_size
-    }
+    """Get database configuration (read-only)"""
+    return DATABASE_CONFIG
 
 def get_redis_config():
-    """Get Redis configuration"""
-    return {
-        "url": settings.redis_url,
-        "confirmations_channel": settings.redis_channel_confirmations
-    }
+    """Get Redis configuration (read-only)"""
+    return REDIS_CONFIG
 
 # Environment-specific configurations
 def get_config_for_environment(env: str = None):
@@ -19,6 +19,7 @@ CREATE INDEX IF NOT EXISTS idx_blockchain_tx_op_type ON blockchain_tx(op_type);
 CREATE INDEX IF NOT EXISTS idx_blockchain_tx_submitted_at ON blockchain_tx(submitted_at);
 CREATE INDEX IF NOT EXISTS idx_blockchain_tx_confirmed_at ON blockchain_tx(confirmed_at);
 CREATE INDEX IF NOT EXISTS idx_blockchain_tx_status ON blockchain_tx(confirmed_at) WHERE confirmed_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_blockchain_tx_unconfirmed ON blockchain_tx(submitted_at) INCLUDE (tx_id, op_type, target_id) WHERE confirmed_at IS NULL;
 
 -- Create function to update updated_at timestamp
 CREATE OR REPLACE FUNCTION update_updated_at_column()
@@ -5,62 +5,164 @@ Unit tests for blockchain bridge service
 import pytest
 import asyncio
 import json
-from unittest.mock import AsyncMock, patch, MagicMock
-from httpx import AsyncClient
+import orjson
+from unittest.mock import AsyncMock, MagicMock
 from fastapi.testclient import TestClient
+import httpx
+from httpx import AsyncClient, ASGITransport
 import hashlib
+import os
+import re
+import time
 import uuid
+from datetime import datetime
+from types import MappingProxyType
+from pydantic import ValidationError
 
 # Import the app
-from main import app, fabric_client, init_db, init_redis
+import main
+from main import (
+    app, fabric_client, init_db, init_redis, TransactionRequest, BlockchainTxRecord,
+    extract_target_id, prepare_chaincode_args, confirm_transactions, build_confirmation_event,
+    store_tx_record, store_tx_records, get_tx_record, publish_confirmations,
+    tx_writer, tx_write_queue, _confirm_from_notifications,
+    TX_COPY_COLUMNS
+)
+from api_client import BlockchainBridgeClient
 
-@pytest.fixture
-async def test_client():
-    """Create test client"""
-    async with AsyncClient(app=app, base_url="http://test") as ac:
+_FIXED_TS = datetime(2025, 1, 1)
+
+_MOCK_TX_ROW = MappingProxyType({
+    "tx_id": "tx_123",
+    "op_type": "issue_did",
+    "target_id": "did:example:123",
+    "submitted_at": _FIXED_TS,
+    "confirmed_at": None,
+    "raw_response": '{"status": "submitted"}'
+})
+
+_MOCK_ROWS = (
+    {
+        "tx_id": "tx_1",
+        "op_type": "issue_did",
+        "target_id": "did:1",
+        "submitted_at": _FIXED_TS,
+        "confirmed_at": None
+    },
+    {
+        "tx_id": "tx_2",
+        "op_type": "record_incident",
+        "target_id": "incident_1",
+        "submitted_at": _FIXED_TS,
+        "confirmed_at": _FIXED_TS
+    }
+)
+
+_VALID_PAYLOAD_HASH = hashlib.sha256(b"test_payload").hexdigest()
+
+_SAMPLE_TRANSACTION_REQUEST = MappingProxyType({
+    "op": "issue_did",
+    "payload_hash": _VALID_PAYLOAD_HASH,
+    "metadata": {
+        "digital_id": "did:example:123",
+        "consent_hash": "consent_hash_123",
+        "issued_at": "2025-01-01T00:00:00Z",
+        "expires_at": "2026-01-01T00:00:00Z",
+        "issuer": "test_issuer"
+    }
+})
+
+@pytest.fixture(scope="session")
+def event_loop():
+    """Share one event loop across the whole test session"""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+@pytest.fixture(autouse=True, scope="session")
+def _dev_mode():
+    """Run the whole session against the mock Fabric client"""
+    prev = fabric_client.dev_mode
+    fabric_client.dev_mode = True
+    yield
+    fabric_client.dev_mode = prev
+
+@pytest.fixture(scope="session")
+def test_client():
+    """Create in-process test client"""
+    return TestClient(app)
+
+@pytest.fixture(scope="session")
+async def async_client():
+    """Create a shared async client for concurrent request tests"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
         yield ac
 
 @pytest.fixture
-def valid_payload_hash():
-    """Generate valid SHA256 hash"""
-    return hashlib.sha256(b"test_payload").hexdigest()
+def fake_conn():
+    """Database connection stand-in with async query methods"""
+    conn = AsyncMock()
+    conn.fetch = AsyncMock(return_value=[])
+    conn.fetchrow = AsyncMock(return_value=None)
+    conn.execute = AsyncMock()
+    return conn
 
 @pytest.fixture
-def sample_transaction_request(valid_payload_hash):
-    """Sample transaction request"""
-    return {
-        "op": "issue_did",
-        "payload_hash": valid_payload_hash,
-        "metadata": {
-            "digital_id": "did:example:123",
-            "consent_hash": "consent_hash_123",
-            "issued_at": "2025-01-01T00:00:00Z",
-            "expires_at": "2026-01-01T00:00:00Z",
-            "issuer": "test_issuer"
-        }
-    }
+def fake_db_pool(fake_conn):
+    """Pool stand-in whose query methods and acquire() all use fake_conn"""
+    pool = MagicMock()
+    pool.acquire.return_value.__aenter__.return_value = fake_conn
+    pool.fetch = fake_conn.fetch
+    pool.fetchrow = fake_conn.fetchrow
+    pool.execute = fake_conn.execute
+    return pool
+
+class _FakeRedis:
+    """Dict-backed stand-in for the Redis commands used by idempotency keys"""
+    
+    def __init__(self):
+        self.data = {}
+    
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+    
+    async def get(self, key):
+        return self.data.get(key)
+    
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """Install an in-memory Redis stand-in as main.redis_client"""
+    fake = _FakeRedis()
+    monkeypatch.setattr(main, "redis_client", fake)
+    return fake
+
+@pytest.fixture(scope="session")
+def valid_payload_hash():
+    """Valid SHA256 hash"""
+    return _VALID_PAYLOAD_HASH
+
+@pytest.fixture(scope="session")
+def sample_transaction_request():
+    """Sample transaction request (read-only; copy before modifying)"""
+    return _SAMPLE_TRANSACTION_REQUEST
 
 class TestTransactionValidation:
     """Test transaction request validation"""
     
-    def test_valid_operations(self):
+    @pytest.mark.parametrize("op", ["issue_did", "record_incident", "anchor_evidence", "append_audit"])
+    def test_valid_operation(self, op):
         """Test valid operation types"""
-        valid_ops = ['issue_did', 'record_incident', 'anchor_evidence', 'append_audit']
-        for op in valid_ops:
-            request = {
-                "op": op,
-                "payload_hash": "a" * 64,  # Valid 64-char hex
-                "metadata": {"test": "data"}
-            }
-            # This should not raise validation error
-            from main import TransactionRequest
-            TransactionRequest(**request)
+        # This should not raise validation error
+        TransactionRequest(op=op, payload_hash="a" * 64, metadata={"test": "data"})
     
     def test_invalid_operation(self):
         """Test invalid operation type"""
-        from main import TransactionRequest
-        from pydantic import ValidationError
-        
         with pytest.raises(ValidationError):
             TransactionRequest(
                 op="invalid_op",
@@ -68,60 +170,70 @@ class TestTransactionValidation:
                 metadata={"test": "data"}
             )
     
-    def test_invalid_payload_hash_length(self):
-        """Test invalid payload hash length"""
-        from main import TransactionRequest
-        from pydantic import ValidationError
-        
+    @pytest.mark.parametrize("hash_val", ["short", "g" * 64, "", "a" * 63, "a" * 65])
+    def test_invalid_payload_hash(self, hash_val):
+        """Test invalid payload hash length and format"""
         with pytest.raises(ValidationError):
             TransactionRequest(
                 op="issue_did",
-                payload_hash="short_hash",
+                payload_hash=hash_val,
                 metadata={"test": "data"}
             )
     
-    def test_invalid_payload_hash_format(self):
-        """Test invalid payload hash format"""
-        from main import TransactionRequest
-        from pydantic import ValidationError
-        
-        with pytest.raises(ValidationError):
-            TransactionRequest(
-                op="issue_did",
-                payload_hash="g" * 64,  # Invalid hex character
-                metadata={"test": "data"}
-            )
+    def test_invalid_payload_hash_int_syntax(self):
+        """Test payload hash rejects int() literal syntax that isn't plain hex"""
+        for payload_hash in ["0x" + "a" * 62, "a_" * 32, " " + "a" * 63]:
+            with pytest.raises(ValidationError):
+                TransactionRequest(
+                    op="issue_did",
+                    payload_hash=payload_hash,
+                    metadata={"test": "data"}
+                )
+    
+    def test_payload_hash_pattern_precompiled(self):
+        """Test the payload hash validator uses a module-level compiled pattern"""
+        assert isinstance(main._HEX64, re.Pattern)
+        assert main._HEX64.fullmatch("a" * 64)
+    
+    @pytest.mark.benchmark
+    def test_validator_throughput(self):
+        """Test 10k random payload hashes validate within a time budget"""
+        blob = os.urandom(32 * 10000)
+        hashes = [blob[i:i + 32].hex() for i in range(0, len(blob), 32)]
+        
+        start = time.perf_counter()
+        for payload_hash in hashes:
+            TransactionRequest(op="issue_did", payload_hash=payload_hash, metadata={})
+        elapsed = time.perf_counter() - start
+        
+        assert elapsed < 2.0
 
 class TestFabricClient:
     """Test Fabric client functionality"""
     
-    @pytest.mark.asyncio
-    async def test_invalid_transaction_request(self, test_client):
+    @pytest.mark.parametrize("invalid_request", [
+        {"op": "invalid_op", "payload_hash": "short", "metadata": {}},
+        {"op": "issue_did", "payload_hash": "short", "metadata": {}},
+        {"op": "issue_did", "payload_hash": "g" * 64, "metadata": {}}
+    ])
+    def test_invalid_transaction_request(self, test_client, invalid_request):
         """Test invalid transaction request"""
-        invalid_request = {
-            "op": "invalid_op",
-            "payload_hash": "short",
-            "metadata": {}
-        }
-        
-        response = await test_client.post("/transactions", json=invalid_request)
+        response = test_client.post("/transactions", json=invalid_request)
         assert response.status_code == 422  # Validation error
     
-    @pytest.mark.asyncio
-    @patch('main.fabric_client.query_chaincode')
-    async def test_query_blockchain(self, mock_query, test_client):
+    def test_query_blockchain(self, test_client, monkeypatch):
         """Test blockchain query"""
-        mock_query.return_value = {
+        monkeypatch.setattr(main.fabric_client, "query_chaincode", AsyncMock(return_value={
             "result": "test_result",
             "mock": True
-        }
+        }))
         
         query_request = {
             "query_type": "did",
             "target_id": "did:example:123"
         }
         
-        response = await test_client.post("/queries", json=query_request)
+        response = test_client.post("/queries", json=query_request)
         
         assert response.status_code == 200
         data = response.json()
@@ -129,62 +241,38 @@ class TestFabricClient:
         assert data["target_id"] == "did:example:123"
         assert "result" in data
     
-    @pytest.mark.asyncio
-    @patch('main.get_tx_record')
-    async def test_get_transaction_status_found(self, mock_get_tx, test_client):
+    def test_get_transaction_status_found(self, test_client, monkeypatch):
         """Test getting transaction status - found"""
         mock_tx_record = {
+            **_MOCK_TX_ROW,
             "tx_id": "test_tx_123",
-            "op_type": "issue_did",
-            "target_id": "did:example:123",
-            "submitted_at": datetime.utcnow(),
-            "confirmed_at": datetime.utcnow(),
-            "raw_response": {"status": "confirmed"}
+            "confirmed_at": _FIXED_TS,
+            "raw_response": '{"status": "confirmed"}'
         }
-        mock_get_tx.return_value = mock_tx_record
+        monkeypatch.setattr(main, "get_tx_record", AsyncMock(return_value=mock_tx_record))
         
-        response = await test_client.get("/transactions/test_tx_123")
+        response = test_client.get("/transactions/test_tx_123")
         
         assert response.status_code == 200
         data = response.json()
         assert data["tx_id"] == "test_tx_123"
         assert data["status"] == "confirmed"
+        assert data["raw_response"] == {"status": "confirmed"}
     
-    @pytest.mark.asyncio
-    @patch('main.get_tx_record')
-    async def test_get_transaction_status_not_found(self, mock_get_tx, test_client):
+    def test_get_transaction_status_not_found(self, test_client, monkeypatch):
         """Test getting transaction status - not found"""
-        mock_get_tx.return_value = None
+        monkeypatch.setattr(main, "get_tx_record", AsyncMock(return_value=None))
         
-        response = await test_client.get("/transactions/nonexistent_tx")
+        response = test_client.get("/transactions/nonexistent_tx")
         
         assert response.status_code == 404
     
-    @pytest.mark.asyncio
-    @patch('main.db_pool')
-    async def test_list_transactions(self, mock_db_pool, test_client):
+    def test_list_transactions(self, test_client, fake_db_pool, fake_conn, monkeypatch):
         """Test listing transactions"""
-        mock_conn = AsyncMock()
-        mock_rows = [
-            {
-                "tx_id": "tx_1",
-                "op_type": "issue_did",
-                "target_id": "did:1",
-                "submitted_at": datetime.utcnow(),
-                "confirmed_at": None
-            },
-            {
-                "tx_id": "tx_2", 
-                "op_type": "record_incident",
-                "target_id": "incident_1",
-                "submitted_at": datetime.utcnow(),
-                "confirmed_at": datetime.utcnow()
-            }
-        ]
-        mock_conn.fetch.return_value = mock_rows
-        mock_db_pool.acquire.return_value.__aenter__.return_value = mock_conn
+        fake_conn.fetch.return_value = list(_MOCK_ROWS)
+        monkeypatch.setattr("main.db_pool", fake_db_pool)
         
-        response = await test_client.get("/transactions")
+        response = test_client.get("/transactions")
         
         assert response.status_code == 200
         data = response.json()
@@ -196,8 +284,6 @@ class TestUtilityFunctions:
     
     def test_extract_target_id(self):
         """Test target ID extraction"""
-        from main import extract_target_id
-        
         # Test issue_did
         metadata = {"digital_id": "did:example:123"}
         target_id = extract_target_id("issue_did", metadata)
@@ -220,8 +306,6 @@ class TestUtilityFunctions:
     
     def test_prepare_chaincode_args(self):
         """Test chaincode arguments preparation"""
-        from main import prepare_chaincode_args
-        
         payload_hash = "abcd1234"
         metadata = {"test": "data"}
         
@@ -234,97 +318,236 @@ class TestUtilityFunctions:
 class TestRedisIntegration:
     """Test Redis integration"""
     
-    @pytest.mark.asyncio
-    @patch('main.redis_client')
-    async def test_publish_confirmation(self, mock_redis):
-        """Test publishing confirmation to Redis"""
-        from main import confirm_transaction
-        
-        mock_redis.publish = AsyncMock()
-        
-        # This would normally update database, but we'll mock that part
-        with patch('main.update_tx_confirmed'):
-            await confirm_transaction("tx_123", "issue_did", "did:example:123")
-        
-        # Verify Redis publish was called
-        mock_redis.publish.assert_called_once()
-        call_args = mock_redis.publish.call_args
-        assert call_args[0][0] == "blockchain.tx.confirmed"
-        
-        # Verify the published data structure
-        published_data = json.loads(call_args[0][1])
-        assert published_data["tx_id"] == "tx_123"
-        assert published_data["type"] == "issue_did"
-        assert published_data["target_id"] == "did:example:123"
-        assert "block_no" in published_data
-        assert "timestamp" in published_data
+    def test_confirmation_event(self):
+        """Test the published confirmation event structure"""
+        event_data = build_confirmation_event("tx_123", "issue_did", "did:example:123", 42, "2025-01-01T00:00:00")
+        
+        published_data = orjson.loads(event_data)
+        assert published_data == {
+            "tx_id": "tx_123",
+            "type": "issue_did",
+            "target_id": "did:example:123",
+            "block_no": 42,
+            "timestamp": "2025-01-01T00:00:00"
+        }
+    
+    async def test_publish_confirmations(self, monkeypatch):
+        """Test confirmation events are flushed in one pipeline"""
+        mock_pipe = MagicMock()
+        mock_pipe.execute = AsyncMock()
+        mock_redis = MagicMock()
+        mock_redis.pipeline.return_value.__aenter__.return_value = mock_pipe
+        monkeypatch.setattr(main, "redis_client", mock_redis)
+        
+        await publish_confirmations([
+            ("tx_1", b'{"tx_id": "tx_1"}'),
+            ("tx_2", b'{"tx_id": "tx_2"}')
+        ])
+        
+        # Verify broadcast and per-transaction publishes for both events
+        mock_pipe.execute.assert_awaited_once()
+        channels = [call[0][0] for call in mock_pipe.publish.call_args_list]
+        assert channels == [
+            "blockchain.tx.confirmed", "blockchain.tx.confirmed.tx_1",
+            "blockchain.tx.confirmed", "blockchain.tx.confirmed.tx_2"
+        ]
+        
+        # Verify the per-transaction keys are stored for late waiters
+        keys = [call[0][0] for call in mock_pipe.set.call_args_list]
+        assert keys == ["blockchain:tx:tx_1:confirmed", "blockchain:tx:tx_2:confirmed"]
+    
+    async def test_publish_confirmation_batch(self, monkeypatch):
+        """Test confirming a batch with one UPDATE and one Redis pipeline"""
+        mock_db_pool = AsyncMock()
+        mock_db_pool.fetch.return_value = [
+            {"tx_id": "tx_1", "op_type": "issue_did", "target_id": "did:1", "block_no": 11},
+            {"tx_id": "tx_2", "op_type": "record_incident", "target_id": "incident_1", "block_no": 22}
+        ]
+        
+        mock_pipe = MagicMock()
+        mock_pipe.execute = AsyncMock()
+        mock_redis = MagicMock()
+        mock_redis.pipeline.return_value.__aenter__.return_value = mock_pipe
+        monkeypatch.setattr(main, "db_pool", mock_db_pool)
+        monkeypatch.setattr(main, "redis_client", mock_redis)
+        
+        await confirm_transactions(["tx_1", "tx_2"])
+        
+        # One statement for the whole batch
+        mock_db_pool.fetch.assert_called_once()
+        assert mock_db_pool.fetch.call_args[0][2] == ["tx_1", "tx_2"]
+        
+        # All events flushed in a single pipeline execute
+        mock_pipe.execute.assert_awaited_once()
+        channels = [call[0][0] for call in mock_pipe.publish.call_args_list]
+        assert channels == [
+            "blockchain.tx.confirmed", "blockchain.tx.confirmed.tx_1",
+            "blockchain.tx.confirmed", "blockchain.tx.confirmed.tx_2"
+        ]
+        assert mock_pipe.set.call_count == 2
 
 class TestDatabaseOperations:
     """Test database operations"""
     
-    @pytest.mark.asyncio
-    @patch('main.db_pool')
-    async def test_store_tx_record(self, mock_db_pool):
+    async def test_store_tx_record(self, fake_db_pool, fake_conn, monkeypatch):
         """Test storing transaction record"""
-        from main import store_tx_record, BlockchainTxRecord
-        from datetime import datetime
-        
-        # Mock database connection
-        mock_conn = AsyncMock()
-        mock_db_pool.acquire.return_value.__aenter__.return_value = mock_conn
-        
         tx_record = BlockchainTxRecord(
             tx_id="tx_123",
             op_type="issue_did",
             target_id="did:example:123",
-            submitted_at=datetime.utcnow(),
+            submitted_at=_FIXED_TS,
             raw_response={"status": "submitted"}
         )
+        monkeypatch.setattr("main.db_pool", fake_db_pool)
         
         await store_tx_record(tx_record)
         
         # Verify database execute was called
-        mock_conn.execute.assert_called_once()
+        fake_conn.execute.assert_called_once()
     
-    @pytest.mark.asyncio
-    @patch('main.db_pool')
-    async def test_get_tx_record(self, mock_db_pool):
-        """Test getting transaction record"""
-        from main import get_tx_record
-        from datetime import datetime
+    async def test_tx_writer_batches(self, monkeypatch):
+        """Test queued transaction records are inserted in one batch"""
+        mock_db_pool = AsyncMock()
+        monkeypatch.setattr(main, "db_pool", mock_db_pool)
+        for tx_id in ("tx_1", "tx_2"):
+            tx_write_queue.put_nowait(BlockchainTxRecord(
+                tx_id=tx_id,
+                op_type="issue_did",
+                target_id="did:example:123",
+                submitted_at=_FIXED_TS,
+                raw_response={"status": "submitted"}
+            ))
+        
+        writer = asyncio.create_task(tx_writer())
+        await asyncio.wait_for(tx_write_queue.join(), timeout=1)
+        writer.cancel()
+        
+        # Verify both rows went out in a single executemany
+        mock_db_pool.executemany.assert_called_once()
+        rows = mock_db_pool.executemany.call_args[0][1]
+        assert [row[0] for row in rows] == ["tx_1", "tx_2"]
+    
+    async def test_tx_writer_falls_back_to_single_inserts(self, monkeypatch):
+        """Test a failed batch is retried row by row so good records are kept"""
+        mock_db_pool = AsyncMock()
+        monkeypatch.setattr(main, "db_pool", mock_db_pool)
+        mock_db_pool.executemany.side_effect = RuntimeError("duplicate key")
+        mock_db_pool.execute.side_effect = [RuntimeError("duplicate key"), None]
+        for tx_id in ("tx_dup", "tx_ok"):
+            tx_write_queue.put_nowait(BlockchainTxRecord(
+                tx_id=tx_id,
+                op_type="issue_did",
+                target_id="did:example:123",
+                submitted_at=_FIXED_TS,
+                raw_response={"status": "submitted"}
+            ))
+        
+        writer = asyncio.create_task(tx_writer())
+        await asyncio.wait_for(tx_write_queue.join(), timeout=1)
+        writer.cancel()
+        
+        # Verify each record got its own insert after the batch failed
+        assert [call[0][1] for call in mock_db_pool.execute.call_args_list] == ["tx_dup", "tx_ok"]
+    
+    def test_tx_write_queue_is_bounded(self):
+        """Test the write-behind queue applies backpressure"""
+        assert tx_write_queue.maxsize == main.TX_WRITE_QUEUE_MAX > 0
+    
+    async def test_store_tx_records_copy(self, monkeypatch):
+        """Test large batches are loaded with COPY"""
+        mock_db_pool = AsyncMock()
+        monkeypatch.setattr(main, "db_pool", mock_db_pool)
+        monkeypatch.setattr(main, "TX_COPY_THRESHOLD", 2)
+        records = [
+            BlockchainTxRecord(
+                tx_id=tx_id,
+                op_type="issue_did",
+                target_id="did:example:123",
+                submitted_at=_FIXED_TS,
+                raw_response={"status": "submitted"}
+            )
+            for tx_id in ("tx_1", "tx_2")
+        ]
         
-        # Mock database connection and response
-        mock_conn = AsyncMock()
-        mock_row = {
-            "tx_id": "tx_123",
-            "op_type": "issue_did",
-            "target_id": "did:example:123",
-            "submitted_at": datetime.utcnow(),
-            "confirmed_at": None,
-            "raw_response": {"status": "submitted"}
-        }
-        mock_conn.fetchrow.return_value = mock_row
-        mock_db_pool.acquire.return_value.__aenter__.return_value = mock_conn
+        await store_tx_records(records)
+        
+        mock_db_pool.executemany.assert_not_called()
+        mock_db_pool.copy_records_to_table.assert_called_once()
+        args, kwargs = mock_db_pool.copy_records_to_table.call_args
+        assert args == ("blockchain_tx",)
+        assert [row[0] for row in kwargs["records"]] == ["tx_1", "tx_2"]
+        assert kwargs["columns"] == TX_COPY_COLUMNS
+
+    async def test_confirm_from_notifications(self, monkeypatch):
+        """Test dev-mode confirmations are driven by insert notifications"""
+        mock_db_pool = AsyncMock()
+        mock_confirm = AsyncMock()
+        monkeypatch.setattr(main, "db_pool", mock_db_pool)
+        monkeypatch.setattr(main, "confirm_transactions", mock_confirm)
+        monkeypatch.setattr(main, "SIMULATED_CONFIRMATION_DELAY_SECONDS", 0.05)
+        listener = AsyncMock()
+        listener.add_termination_listener = MagicMock()
+        listener.remove_termination_listener = MagicMock()
+        mock_db_pool.acquire.return_value = listener
+        mock_db_pool.fetch.return_value = [{"tx_id": "backlog_tx"}]
+        
+        task = asyncio.create_task(_confirm_from_notifications())
+        await asyncio.sleep(0.01)
+        
+        # Simulate two inserts arriving on the listener connection
+        on_tx_new = listener.add_listener.call_args[0][1]
+        on_tx_new(listener, 1, "tx_new", "tx_1")
+        on_tx_new(listener, 1, "tx_new", "tx_2")
+        await asyncio.sleep(0.2)
+        
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        
+        # Backlog first, then both notified transactions, none confirmed twice
+        confirmed = [tx_id for call in mock_confirm.call_args_list for tx_id in call[0][0]]
+        assert confirmed == ["backlog_tx", "tx_1", "tx_2"]
+        mock_db_pool.release.assert_awaited_once_with(listener)
+    
+    async def test_confirm_from_notifications_exits_on_connection_loss(self, monkeypatch):
+        """Test a dropped listener connection ends the loop so the monitor reconnects"""
+        mock_db_pool = AsyncMock()
+        mock_db_pool.fetch.return_value = []
+        monkeypatch.setattr(main, "db_pool", mock_db_pool)
+        listener = AsyncMock()
+        listener.add_termination_listener = MagicMock()
+        listener.remove_termination_listener = MagicMock()
+        mock_db_pool.acquire.return_value = listener
+        
+        task = asyncio.create_task(_confirm_from_notifications())
+        await asyncio.sleep(0.01)
+        
+        # Simulate the server closing the listener connection
+        on_terminated = listener.add_termination_listener.call_args[0][0]
+        on_terminated(listener)
+        
+        with pytest.raises(ConnectionError):
+            await asyncio.wait_for(task, timeout=1)
+        listener.remove_termination_listener.assert_called_once_with(on_terminated)
+        mock_db_pool.release.assert_awaited_once_with(listener)
+    
+    async def test_get_tx_record(self, fake_db_pool, fake_conn, monkeypatch):
+        """Test getting transaction record"""
+        # Mock database response
+        fake_conn.fetchrow.return_value = _MOCK_TX_ROW
+        monkeypatch.setattr("main.db_pool", fake_db_pool)
         
         result = await get_tx_record("tx_123")
         
-        assert result == mock_row
-        mock_conn.fetchrow.assert_called_once()
+        assert result == _MOCK_TX_ROW
+        fake_conn.fetchrow.assert_called_once()
 
 # Integration tests
 class TestIntegration:
     """Integration tests"""
     
-    @pytest.mark.asyncio
-    @patch('main.init_db')
-    @patch('main.init_redis')  
-    async def test_transaction_flow(self, mock_redis, mock_db):
+    async def test_transaction_flow(self):
         """Test complete transaction flow"""
-        from main import fabric_client
-        
-        # Set dev mode for testing
-        fabric_client.dev_mode = True
-        
         # Test transaction submission
         result = await fabric_client.submit_transaction(
             "issue_did", 
@@ -341,41 +564,34 @@ class TestIntegration:
         )
         
         assert "result" in query_result
-
-if __name__ == "__main__":
-    pytest.main([__file__])
-
-def test_mock_submit_transaction(self):
-    """Test mock transaction submission"""
-    client = fabric_client
-    client.dev_mode = True
-
-    result = asyncio.run(client.submit_transaction("issue_did", ["hash123", '{"test": "data"}']))
-
-    assert "tx_id" in result
-    assert result["status"] == "submitted"
-    assert result["mock"] is True
-    assert result["function"] == "issue_did"
-
-@pytest.mark.asyncio
-async def test_mock_query(self):
-    """Test mock query functionality"""
-    client = fabric_client
-    client.dev_mode = True
-
-    result = await client.query_chaincode("query_did", ["did:example:123"])
-
-    assert "result" in result
-    assert result["mock"] is True
-    assert result["function"] == "query_did"
+    
+    async def test_mock_submit_transaction(self):
+        """Test mock transaction submission"""
+        client = fabric_client
+        
+        result = await client.submit_transaction("issue_did", ["hash123", '{"test": "data"}'])
+        
+        assert "tx_id" in result
+        assert result["status"] == "submitted"
+        assert result["mock"] is True
+        assert result["function"] == "issue_did"
+    
+    async def test_mock_query(self):
+        """Test mock query functionality"""
+        client = fabric_client
+        
+        result = await client.query_chaincode("query_did", ["did:example:123"])
+        
+        assert "result" in result
+        assert result["mock"] is True
+        assert result["function"] == "query_did"
 
 class TestAPIEndpoints:
     """Test API endpoints"""
     
-    @pytest.mark.asyncio
-    async def test_health_check(self, test_client):
+    def test_health_check(self, test_client):
         """Test health check endpoint"""
-        response = await test_client.get("/health")
+        response = test_client.get("/health")
         assert response.status_code == 200
         
         data = response.json()
@@ -383,43 +599,252 @@ class TestAPIEndpoints:
         assert "timestamp" in data
         assert "dev_mode" in data
     
-    @pytest.mark.asyncio
-    @patch('main.init_db')
-    @patch('main.init_redis')
-    @patch('main.store_tx_record')
-    @patch('main.fabric_client.submit_transaction')
-    async def test_submit_transaction(
-        self, 
-        mock_fabric_submit,
-        mock_store,
-        mock_redis,
-        mock_db,
-        test_client,
-        sample_transaction_request
-    ):
+    def test_submit_transaction(self, test_client, sample_transaction_request, monkeypatch):
         """Test transaction submission"""
         # Mock fabric response
-        mock_fabric_submit.return_value = {
+        monkeypatch.setattr(main.fabric_client, "submit_transaction", AsyncMock(return_value={
             "tx_id": "fabric_tx_123",
             "status": "submitted"
-        }
-        mock_store.return_value = None
+        }))
+        monkeypatch.setattr(main, "tx_write_queue", asyncio.Queue())
         
-        response = await test_client.post("/transactions", json=sample_transaction_request)
+        response = test_client.post("/transactions", json=dict(sample_transaction_request))
         
         assert response.status_code == 200
         data = response.json()
         assert "tx_id" in data
         assert data["status"] == "submitted"
     
-    @pytest.mark.asyncio
-    async def test_submit_transaction_invalid_payload(self, test_client):
-        """Test transaction submission with invalid payload"""
-        invalid_request = {
-            "op": "invalid_op",
-            "payload_hash": "short",
-            "metadata": {}
-        }
+    async def test_submit_many_transactions(self, async_client, monkeypatch):
+        """Test concurrent transaction submissions over one client"""
+        monkeypatch.setattr(main.fabric_client, "submit_transaction", AsyncMock(
+            return_value={"tx_id": "fabric_tx_123", "status": "submitted"}
+        ))
+        queue = asyncio.Queue()
+        monkeypatch.setattr(main, "tx_write_queue", queue)
+        payloads = [
+            {
+                "op": "issue_did",
+                "payload_hash": hashlib.sha256(str(i).encode()).hexdigest(),
+                "metadata": {"digital_id": f"did:example:{i}"}
+            }
+            for i in range(200)
+        ]
+        semaphore = asyncio.Semaphore(50)
         
-        response = await test_client.post("/transactions", json=invalid_request)
-        assert response.status_code == 422  # Validation error
\ No newline at end of file
+        async def submit(payload):
+            async with semaphore:
+                return await async_client.post("/transactions", json=payload)
+        
+        responses = await asyncio.gather(*[submit(p) for p in payloads])
+        
+        assert all(r.status_code == 200 for r in responses)
+        assert len({r.json()["tx_id"] for r in responses}) == len(payloads)
+        assert queue.qsize() == len(payloads)
+
+    def test_idempotent_replay(self, test_client, sample_transaction_request, fake_redis, monkeypatch):
+        """Test a retry with the same Idempotency-Key replays the first response"""
+        submit = AsyncMock(return_value={"tx_id": "fabric_tx_123", "status": "submitted"})
+        monkeypatch.setattr(main.fabric_client, "submit_transaction", submit)
+        monkeypatch.setattr(main, "tx_write_queue", asyncio.Queue())
+        headers = {"Idempotency-Key": "retry-1"}
+        
+        first = test_client.post("/transactions", json=dict(sample_transaction_request), headers=headers)
+        second = test_client.post("/transactions", json=dict(sample_transaction_request), headers=headers)
+        
+        assert first.status_code == second.status_code == 200
+        assert first.json() == second.json()
+        submit.assert_awaited_once()
+    
+    def test_idempotency_key_reused_with_different_body(self, test_client, sample_transaction_request,
+                                                         fake_redis, monkeypatch):
+        """Test an Idempotency-Key can't be replayed for a different request"""
+        monkeypatch.setattr(main.fabric_client, "submit_transaction", AsyncMock(
+            return_value={"tx_id": "fabric_tx_123", "status": "submitted"}
+        ))
+        monkeypatch.setattr(main, "tx_write_queue", asyncio.Queue())
+        headers = {"Idempotency-Key": "retry-2"}
+        other_request = {**sample_transaction_request, "payload_hash": "b" * 64}
+        
+        first = test_client.post("/transactions", json=dict(sample_transaction_request), headers=headers)
+        second = test_client.post("/transactions", json=other_request, headers=headers)
+        
+        assert first.status_code == 200
+        assert second.status_code == 422
+    
+    async def test_concurrent_idempotent_requests_submit_once(self, async_client, sample_transaction_request,
+                                                              fake_redis, monkeypatch):
+        """Test concurrent requests with one Idempotency-Key submit only once"""
+        async def slow_submit(function_name, args):
+            await asyncio.sleep(0.05)
+            return {"tx_id": "fabric_tx_123", "status": "submitted"}
+        
+        submit = AsyncMock(side_effect=slow_submit)
+        monkeypatch.setattr(main.fabric_client, "submit_transaction", submit)
+        monkeypatch.setattr(main, "tx_write_queue", asyncio.Queue())
+        headers = {"Idempotency-Key": "retry-3"}
+        
+        responses = await asyncio.gather(*(
+            async_client.post("/transactions", json=dict(sample_transaction_request), headers=headers)
+            for _ in range(2)
+        ))
+        
+        assert sorted(r.status_code for r in responses) == [200, 409]
+        submit.assert_awaited_once()
+    
+    def test_failed_submission_releases_idempotency_key(self, test_client, sample_transaction_request,
+                                                        fake_redis, monkeypatch):
+        """Test a failed request doesn't block its retry"""
+        monkeypatch.setattr(main.fabric_client, "submit_transaction", AsyncMock(side_effect=[
+            RuntimeError("gateway down"),
+            {"tx_id": "fabric_tx_123", "status": "submitted"}
+        ]))
+        monkeypatch.setattr(main, "tx_write_queue", asyncio.Queue())
+        headers = {"Idempotency-Key": "retry-4"}
+        
+        first = test_client.post("/transactions", json=dict(sample_transaction_request), headers=headers)
+        second = test_client.post("/transactions", json=dict(sample_transaction_request), headers=headers)
+        
+        assert first.status_code == 500
+        assert second.status_code == 200
+    
+    def test_no_fingerprint_without_idempotency_key(self, test_client, sample_transaction_request, monkeypatch):
+        """Test requests without an Idempotency-Key skip the body fingerprint"""
+        monkeypatch.setattr(main.fabric_client, "submit_transaction", AsyncMock(
+            return_value={"tx_id": "fabric_tx_123", "status": "submitted"}
+        ))
+        monkeypatch.setattr(main, "tx_write_queue", asyncio.Queue())
+        fingerprint = MagicMock()
+        monkeypatch.setattr(main, "request_fingerprint", fingerprint)
+        
+        response = test_client.post("/transactions", json=dict(sample_transaction_request))
+        
+        assert response.status_code == 200
+        fingerprint.assert_not_called()
+    
+    def test_submit_transaction_batch(self, test_client, sample_transaction_request, monkeypatch):
+        """Test batch submission reports failures per item"""
+        monkeypatch.setattr(main.fabric_client, "submit_transaction", AsyncMock(side_effect=[
+            {"tx_id": "fabric_tx_1", "status": "submitted"},
+            RuntimeError("gateway down")
+        ]))
+        monkeypatch.setattr(main, "tx_write_queue", asyncio.Queue())
+        
+        ops = [dict(sample_transaction_request), dict(sample_transaction_request)]
+        response = test_client.post("/transactions:batch", json={"ops": ops})
+        
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [r["status"] for r in results] == ["submitted", "error"]
+        assert results[0]["tx_id"]
+        assert "gateway down" in results[1]["error"]
+        assert main.tx_write_queue.qsize() == 1
+
+class TestBridgeClientBatching:
+    """Test submission coalescing in the bridge API client"""
+    
+    @staticmethod
+    async def _submit_many(handler, count):
+        """Submit count audits concurrently through a client backed by handler"""
+        client = BlockchainBridgeClient(batch_window=0.05, max_retries=0)
+        client._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            results = await asyncio.wait_for(asyncio.gather(*(
+                client.append_audit(None, f"audit_{i}", audit_hash=hashlib.sha256(str(i).encode()).hexdigest())
+                for i in range(count)
+            )), timeout=2)
+        finally:
+            await client._http_client.aclose()
+            await client.close()
+        return client, results
+    
+    async def test_falls_back_to_single_submissions(self):
+        """Test a bridge without the batch route gets one request per item"""
+        single_posts = []
+        
+        def handler(request):
+            if request.url.path == "/transactions:batch":
+                return httpx.Response(404)
+            single_posts.append(orjson.loads(request.content))
+            return httpx.Response(200, json={"tx_id": f"tx_{len(single_posts)}", "status": "submitted"})
+        
+        client, results = await self._submit_many(handler, 3)
+        
+        assert client._batch_supported is False
+        assert len(single_posts) == 3
+        assert all(r.status == "submitted" for r in results)
+        assert {r.tx_id for r in results} == {"tx_1", "tx_2", "tx_3"}
+    
+    async def test_short_batch_response_fails_remaining(self):
+        """Test callers left without a batch result get an error instead of hanging"""
+        def handler(request):
+            return httpx.Response(200, json={"results": [{"tx_id": "tx_1", "status": "submitted"}]})
+        
+        _, results = await self._submit_many(handler, 3)
+        
+        assert results[0].status == "submitted"
+        assert [r.status for r in results[1:]] == ["error", "error"]
+
+class TestBridgeClientHashCache:
+    """Test identity-keyed payload hash memoization in the bridge API client"""
+    
+    def test_same_object_hits_cache(self):
+        """Test only the identical bytes object reuses its memoized hash"""
+        client = BlockchainBridgeClient()
+        payload = os.urandom(4096)
+        expected = hashlib.sha256(payload).hexdigest()
+        
+        assert client._generate_payload_hash(payload) == expected
+        assert client._cached_payload_hash(payload) == expected
+        
+        copy = bytes(bytearray(payload))
+        assert client._cached_payload_hash(copy) is None
+        assert client._generate_payload_hash(copy) == expected
+        
+        mutable = bytearray(payload)
+        assert client._generate_payload_hash(mutable) == expected
+        assert client._cached_payload_hash(mutable) is None
+        
+        client.clear_hash_cache()
+        assert client._cached_payload_hash(payload) is None
+    
+    def test_cache_is_bounded(self):
+        """Test the cache evicts the oldest payloads past its entry limit"""
+        client = BlockchainBridgeClient()
+        payloads = [os.urandom(64) for _ in range(client.HASH_CACHE_MAX_ENTRIES + 1)]
+        for payload in payloads:
+            client._generate_payload_hash(payload)
+        
+        assert len(client._hash_cache) == client.HASH_CACHE_MAX_ENTRIES
+        assert client._cached_payload_hash(payloads[0]) is None
+        assert client._hash_cache_bytes == 64 * client.HASH_CACHE_MAX_ENTRIES
+    
+    async def test_large_evidence_reupload_hits_cache(self):
+        """Test large evidence blobs are memoized across re-uploads"""
+        client = BlockchainBridgeClient()
+        evidence = os.urandom(4 * 1024 * 1024)
+        
+        digest = await client._hash_evidence(evidence)
+        assert digest == hashlib.sha256(evidence).hexdigest()
+        assert client._cached_payload_hash(evidence) == digest
+        assert await client._hash_evidence(evidence) == digest
+    
+    @pytest.mark.benchmark
+    async def test_reupload_hash_throughput(self):
+        """Test re-hashing the same 16 MiB evidence blob is far cheaper than the first hash"""
+        client = BlockchainBridgeClient()
+        evidence = os.urandom(16 * 1024 * 1024)
+        
+        start = time.perf_counter()
+        await client._hash_evidence(evidence)
+        first = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        for _ in range(100):
+            await client._hash_evidence(evidence)
+        repeated = time.perf_counter() - start
+        
+        assert repeated < first
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,88 @@
+import pytest
+import asyncio
+
+import main
+
+class _FlakyRedis:
+    """In-memory stand-in for the lock commands whose renewals can be made to fail"""
+    
+    def __init__(self):
+        self.data = {}
+        self.fail_renewals = 0
+    
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+    
+    async def get(self, key):
+        return self.data.get(key)
+    
+    async def eval(self, script, numkeys, key, worker_id, ttl):
+        if self.fail_renewals:
+            self.fail_renewals -= 1
+            raise ConnectionError("connection reset")
+        return 1 if self.data.get(key) == worker_id else 0
+
+@pytest.fixture
+def flaky_redis(monkeypatch):
+    """Install the flaky Redis stand-in and a short lock TTL"""
+    fake = _FlakyRedis()
+    monkeypatch.setattr(main, "redis_client", fake)
+    monkeypatch.setattr(main, "EVENT_WRITER_LOCK_TTL_SECONDS", 0.03)
+    monkeypatch.setattr(main, "is_event_writer", False)
+    return fake
+
+async def _elect(worker_id, rounds):
+    """Run the election loop for a number of renewal periods"""
+    task = asyncio.create_task(main.event_writer_election(worker_id))
+    await asyncio.sleep(main.EVENT_WRITER_LOCK_TTL_SECONDS / 3 * rounds)
+    task.cancel()
+
+async def test_event_writer_keeps_role_on_renew_failure(flaky_redis):
+    """Test a transient Redis error during renewal doesn't give up the writer role"""
+    await _elect("worker-1", 1.5)
+    assert main.is_event_writer
+    
+    flaky_redis.fail_renewals = 2
+    await _elect("worker-1", 3.5)
+    
+    assert flaky_redis.fail_renewals == 0
+    assert main.is_event_writer
+    assert flaky_redis.data[main.EVENT_WRITER_LOCK_KEY] == "worker-1"
+
+async def test_event_writer_retakes_own_lock(flaky_redis):
+    """Test a worker that lost track of its role re-takes a lock it still holds"""
+    flaky_redis.data[main.EVENT_WRITER_LOCK_KEY] = "worker-1"
+    
+    await _elect("worker-1", 1.5)
+    
+    assert main.is_event_writer
+
+async def test_event_writer_lock_is_exclusive(flaky_redis):
+    """Test a second worker doesn't take a lock held by another"""
+    flaky_redis.data[main.EVENT_WRITER_LOCK_KEY] = "worker-2"
+    
+    await _elect("worker-1", 1.5)
+    
+    assert not main.is_event_writer
+
+async def test_full_write_queue_drops_and_counts(monkeypatch):
+    """Test a full event write queue drops the row and counts it instead of growing"""
+    queue = asyncio.Queue(maxsize=1)
+    monkeypatch.setattr(main, "alert_write_queue", queue)
+    monkeypatch.setattr(main, "dropped_event_rows", {"alert": 0, "incident": 0})
+    alert = {
+        "alert_id": "alert_1",
+        "timestamp": "2025-01-01T00:00:00Z",
+        "location": {"lat": 12.97, "lon": 77.59},
+        "severity": "high"
+    }
+    
+    await main.handle_alert_created(alert)
+    await main.handle_alert_created({**alert, "alert_id": "alert_2"})
+    
+    assert queue.qsize() == 1
+    assert queue.get_nowait()[0] == "alert_1"
+    assert main.dropped_event_rows["alert"] == 1